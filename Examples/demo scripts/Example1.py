@@ -4,12 +4,12 @@
 
 from EzGM.selection import ConditionalSpectrum
 from EzGM.utility import check_gmpe_attributes, run_time
-from time import time
+from time import monotonic
 import numpy as np
 
 # A) IM = Sa(Tstar) Database = NGA_W2
 # -----------------------------------
-start_time = time()
+start_time = monotonic()
 
 # A.1) Initialize the conditional_spectrum object for record selection, check which parameters are required for the gmpe you are using.
 cs = ConditionalSpectrum(database='NGA_W2', output_directory='Outputs_A')
@@ -50,7 +50,7 @@ run_time(start_time)
 
 # B) IM = Sa(Tstar) Database = ESM_2018
 # -------------------------------------
-start_time = time()
+start_time = monotonic()
 
 # B.1) Initialize the conditional_spectrum object for record selection, check which parameters are required for the gmpe you are using.
 cs = ConditionalSpectrum(database='ESM_2018', output_directory='Outputs_B')
@@ -93,7 +93,7 @@ run_time(start_time)
 
 # C) IM = AvgSa(Tstar) Database = NGA_W2
 # --------------------------------------
-start_time = time()
+start_time = monotonic()
 
 # C.1) Initialize the conditional_spectrum object for record selection, check which parameters are required for the gmpe you are using.
 cs = ConditionalSpectrum(database='NGA_W2', output_directory='Outputs_C')
@@ -4,7 +4,7 @@
 
 from EzGM.selection import CodeSpectrum
 from EzGM.utility import run_time
-from time import time
+from time import monotonic
 import os
 
 # Path to user-defined target spectrum
@@ -15,7 +15,7 @@ target_path = os.path.join(parent_path,'input files','Target_Spectrum.txt')
 # Comment the next line if you want to use the user-defined spectrum.
 target_path=None 
 
-start_time = time()
+start_time = monotonic()
 # 1) Initialize the code_spectrum object for record selection
 # Set the record selection settings at this stage
 spec = CodeSpectrum(database='NGA_W2', output_directory='Outputs', target_path=target_path, num_records=11, num_components=2,
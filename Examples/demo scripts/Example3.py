@@ -5,11 +5,11 @@
 
 from EzGM.selection import ConditionalSpectrum
 from EzGM.utility import run_time, make_dir, hazard_curve, disaggregation_mag_dist, disaggregation_mag_dist_eps, check_gmpe_attributes, get_esm_token
-from time import time
+from time import monotonic
 import os
 import numpy as np
 
-start_time = time()
+start_time = monotonic()
 
 # Hazard Analysis via OpenQuake
 # Set path to OpenQuake model .ini file path
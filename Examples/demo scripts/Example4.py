@@ -4,13 +4,13 @@
 
 from EzGM import signal
 from EzGM.utility import read_esm, run_time
-from time import time
+from time import monotonic
 import numpy as np
 import matplotlib.pyplot as plt
 import os
 
 # Acquire the run start time
-start_time = time()
+start_time = monotonic()
 
 # Read records
 parent_path = os.path.dirname(os.path.realpath(""))
@@ -6,14 +6,16 @@ Utility functions
 import zipfile
 import difflib
 import os
-import sys
 import errno
 import shutil
 import stat
+import subprocess
 from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import re
-from time import time
-from datetime import datetime
+from time import monotonic
+from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 from scipy import interpolate
@@ -24,6 +26,7 @@ from matplotlib import cm
 from matplotlib.patches import Patch
 import requests
 import json
+from numba import njit
 from openquake.hazardlib import gsim, nrml
 from openquake.baselib.node import Node
 
@@ -40,9 +43,131 @@ plt.rc('ytick', labelsize=SMALL_SIZE)  # fontsize of the tick labels
 plt.rc('legend', fontsize=MEDIUM_SIZE)  # legend fontsize
 plt.rc('figure', titlesize=BIGGER_SIZE)  # fontsize of the figure title
 
+# Spectral shape parameters (S, Tb, Tc, Td) of EN 1998-1:2004, keyed by (spectrum type, site class)
+_EC8_SPECTRUM_PROPS = {
+    ('Type1', 'A'): (1.00, 0.15, 0.4, 2.0),
+    ('Type1', 'B'): (1.20, 0.15, 0.5, 2.0),
+    ('Type1', 'C'): (1.15, 0.20, 0.6, 2.0),
+    ('Type1', 'D'): (1.35, 0.20, 0.8, 2.0),
+    ('Type1', 'E'): (1.40, 0.15, 0.5, 2.0),
+    ('Type2', 'A'): (1.00, 0.05, 0.25, 1.2),
+    ('Type2', 'B'): (1.35, 0.05, 0.25, 1.2),
+    ('Type2', 'C'): (1.50, 0.10, 0.25, 1.2),
+    ('Type2', 'D'): (1.80, 0.10, 0.30, 1.2),
+    ('Type2', 'E'): (1.60, 0.05, 0.25, 1.2),
+}
+
+# Importance factors of EN 1998-1:2004, keyed by importance class
+_EC8_IMPORTANCE_FACTORS = {'I': 0.8, 'II': 1.0, 'III': 1.2, 'IV': 1.4}
+
+# Pattern to pull the salient values out of the comment line of OpenQuake result files,
+# robust against the quoting and ordering differences between engine versions
+_OQ_HEADER_PARAM_PATTERN = re.compile(r'\b(investigation_time|lon|lat)=["\']?([-\d.]+)')
+
+# Targeted probability of exceedance in 50 years, keyed by the earthquake
+# ground motion intensity level (DD) of TBEC2018
+_TBEC2018_DD_TO_POE = {1: '2', 2: '10', 3: '50', 4: '68'}
+
+# Territorial bounding box of the TBEC2018 hazard map
+_TBEC2018_LON_LIMITS = (24.55, 45.95)
+_TBEC2018_LAT_LIMITS = (34.25, 42.95)
+
+# Local soil response tables of TBEC2018: short period (FS) and 1.0 second (F1)
+# coefficients tabulated against the map spectral accelerations, one row per site class
+_TBEC2018_SS_BREAKPOINTS = np.array([0.25, 0.5, 0.75, 1.0, 1.25, 1.5])
+_TBEC2018_S1_BREAKPOINTS = np.array([0.1, 0.2, 0.3, 0.4, 0.5, 0.6])
+_TBEC2018_FS_TABLE = {
+    'ZA': np.array([0.8, 0.8, 0.8, 0.8, 0.8, 0.8]),
+    'ZB': np.array([0.9, 0.9, 0.9, 0.9, 0.9, 0.9]),
+    'ZC': np.array([1.3, 1.3, 1.2, 1.2, 1.2, 1.2]),
+    'ZD': np.array([1.6, 1.4, 1.2, 1.1, 1.0, 1.0]),
+    'ZE': np.array([2.4, 1.7, 1.3, 1.1, 0.9, 0.8]),
+}
+_TBEC2018_F1_TABLE = {
+    'ZA': np.array([0.8, 0.8, 0.8, 0.8, 0.8, 0.8]),
+    'ZB': np.array([0.8, 0.8, 0.8, 0.8, 0.8, 0.8]),
+    'ZC': np.array([1.5, 1.5, 1.5, 1.5, 1.5, 1.4]),
+    'ZD': np.array([2.4, 2.2, 2.0, 1.9, 1.8, 1.7]),
+    'ZE': np.array([4.2, 3.3, 2.8, 2.4, 2.2, 2.0]),
+}
+
+# Shared HTTP session so that repeated web-service queries reuse the TCP/TLS connection
+_session = requests.Session()
+
 # FUNCTIONS TO POST-PROCESS OPENQUAKE PSHA RESULTS
 # ---------------------------------------------------------------------
 
+def _read_hazard_results_file(file_path):
+    """
+    Details
+    -------
+    Reads a single OpenQuake hazard curve result file.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the hazard curve result file.
+
+    Returns
+    -------
+    lat : list
+        Latitude of each site in the file.
+    lon : list
+        Longitude of each site in the file.
+    im : list
+        Intensity measure of each site in the file.
+    id_no : list
+        Id number of the file, repeated per site.
+    poe_data : list
+        Probabilities of exceedance per site, as numpy.ndarray.
+    iml_data : list
+        Intensity measure levels per site, as numpy.ndarray.
+    inv_t : float
+        Investigation time.
+    """
+
+    file = os.path.basename(file_path)
+    # Strip the IM out of the file name
+    im_type = (file.rsplit('-')[2]).rsplit('_')[0]
+    # Get the id number of the file
+    idn = (file.rsplit('_')[2]).rsplit('.')[0]
+
+    # Read the header comment and load the results as a dataframe in a single pass
+    with open(file_path, "r") as f:
+        header = f.readline()
+        df = pd.read_csv(f)
+    inv_t = float(dict(_OQ_HEADER_PARAM_PATTERN.findall(header))['investigation_time'])
+
+    # Get the column headers (but they have a 'poe-' string in them to strip out)
+    iml = list(df.columns.values)[3:]  # List of headers
+    iml = [float(i[4:]) for i in iml]  # Strip out the actual IM values
+
+    lat, lon, im, id_no = [], [], [], []
+    poe_data, iml_data = [], []
+
+    # For each of the sites investigated
+    for site in np.arange(len(df)):
+
+        # Append each site's info to the output array
+        lat.append([df.lat[site]][0])
+        lon.append([df.lon[site]][0])
+        im.append(im_type)
+        id_no.append(idn)
+
+        # Get the array of poe in inv_t and corresponding imls
+        tmp1 = np.array(df.iloc[site, 3:].values)
+        tmp2 = np.array(iml)
+        # get rid of any infinite or nan value in a single pass
+        finite = np.isfinite(tmp1)
+        tmp1 = tmp1[finite]
+        tmp2 = tmp2[finite]
+        # append
+        poe_data.append(tmp1)
+        iml_data.append(tmp2)
+
+    return lat, lon, im, id_no, poe_data, iml_data, inv_t
+
+
 def hazard_curve(poes, path_hazard_results, output_dir='Post_Outputs', filename='hazard_curve-mean', show=1):
     """
     Details
@@ -77,69 +202,34 @@ def hazard_curve(poes, path_hazard_results, output_dir='Post_Outputs', filename=
     id_no = []
     imls = []
 
-    # Read through each file in the outputs folder
-    for file in os.listdir(path_hazard_results):
-        if file.startswith(filename):
-
-            # print(file)
-            # Strip the IM out of the file name
-            im_type = (file.rsplit('-')[2]).rsplit('_')[0]
-
-            # Get the id number of the file
-            idn = (file.rsplit('_')[2]).rsplit('.')[0]
-
-            # Load the results in as a dataframe
-            df = pd.read_csv(''.join([path_hazard_results, '/', file]), skiprows=1)
-
-            # Get the column headers (but they have a 'poe-' string in them to strip out)
-            iml = list(df.columns.values)[3:]  # List of headers
-            iml = [float(i[4:]) for i in iml]  # Strip out the actual IM values
-            f = open(''.join([path_hazard_results, '/', file]), "r")
-            temp1 = f.readline().split(',')
-            temp2 = list(filter(None, temp1))
-            inv_t = float(list(filter(lambda x: 'investigation_time=' in x, temp2))[0].replace(" investigation_time=", ""))
-            f.close()
-
-            # For each of the sites investigated
-            for site in np.arange(len(df)):
-
-                # Append each site's info to the output array
-                lat.append([df.lat[site]][0])
-                lon.append([df.lon[site]][0])
-                im.append(im_type)
-                id_no.append(idn)
-
-                # Get the array of poe in inv_t and corresponding imls
-                tmp1 = np.array(df.iloc[site, 3:].values)
-                tmp2 = np.array(iml)
-                # get rid of any infinite or nan value
-                infs = np.isinf(tmp1)
-                tmp1 = tmp1[~infs]
-                tmp2 = tmp2[~infs]
-                nans = np.isnan(tmp1)
-                tmp1 = tmp1[~nans]
-                tmp2 = tmp2[~nans]
-                # append
-                poe_data.append(tmp1)
-                iml_data.append(tmp2)
+    # Result files are independent of each other, hence read them concurrently.
+    # The GIL is released inside the pandas CSV reader and the numpy ufuncs.
+    files = [os.path.join(path_hazard_results, file) for file in sorted(os.listdir(path_hazard_results))
+             if file.startswith(filename)]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for result in executor.map(_read_hazard_results_file, files):
+            lat.extend(result[0])
+            lon.extend(result[1])
+            im.extend(result[2])
+            id_no.extend(result[3])
+            poe_data.extend(result[4])
+            iml_data.extend(result[5])
+            inv_t = result[6]
 
     # Get intensity measure levels corresponding to poes
     fig = plt.figure()
     for i in range(len(iml_data)):
         plt.loglog(iml_data[i], poe_data[i], label=im[i])
-        iml = interpolate.interp1d(poe_data[i], iml_data[i], kind='linear')(poes)
+        # Hazard curves are monotone, so each target poe is resolved with a binary search
+        # over the curve itself; argsort guards against non-monotone numerical noise
+        order = np.argsort(poe_data[i])
+        iml = np.interp(poes, poe_data[i][order], iml_data[i][order])
         imls.append(iml)
         fname = os.path.join(output_dir, 'imls_' + im[i] + '.out')
-        f = open(fname, 'w+')
-        for j in iml:
-            f.write("%.3f\n" % j)
-        f.close()
+        np.savetxt(fname, iml, fmt='%.3f')
 
     fname = os.path.join(output_dir, 'poes.out')
-    f = open(fname, 'w+')
-    for j in poes:
-        f.write("%.4f\n" % j)
-    f.close()
+    np.savetxt(fname, np.asarray(poes), fmt='%.4f')
 
     plt.xlabel('IM [g]')
     plt.ylabel(f'Probability of Exceedance in {inv_t:.0f} years')
@@ -153,11 +243,8 @@ def hazard_curve(poes, path_hazard_results, output_dir='Post_Outputs', filename=
         plt.show()
     plt.close(fig)
 
-    for i, poe in enumerate(poe_data):
-        poe.shape = (len(poe), 1)
-        imls = np.asarray(iml_data[i])
-        imls.shape = (len(imls), 1)
-        haz_cur = np.concatenate([imls, poe], axis=1)
+    for i in range(len(poe_data)):
+        haz_cur = np.column_stack([iml_data[i], poe_data[i]])
         fname = os.path.join(output_dir, 'HazardCurve_' + im[i] + '.out')
         np.savetxt(fname, haz_cur)
 
@@ -195,43 +282,42 @@ def disaggregation_mag_dist(mag_bin, dist_bin, path_disagg_results, output_dir='
 
     for file in os.listdir(path_disagg_results):
         if file.startswith(filename) and 'Mag_Dist_Eps' not in file:
-            # Load the dataframe
-            df = pd.read_csv(''.join([path_disagg_results, '/', file]), skiprows=1)
+            # Read the header comment and load the dataframe in a single pass
+            with open(''.join([path_disagg_results, '/', file]), "r") as f:
+                header = f.readline()
+                df = pd.read_csv(f)
             for key in df.keys():
                 if key.startswith('rlz') or key == 'mean':
                     hz_key = key
-            poes = np.unique(df['poe']).tolist()
-            poes.sort(reverse=True)
+            poes = np.unique(df['poe'].to_numpy())[::-1].tolist()  # np.unique already sorts ascending
             # Get some salient values
-            f = open(''.join([path_disagg_results, '/', file]), "r")
-            ff = f.readline().split(',')
-            lon = float(list(filter(lambda x: 'lon=' in x, ff))[0].replace(" lon=", ""))
-            lat = float(list(filter(lambda x: 'lat=' in x, ff))[0].replace(" lat=", "").replace("\"\n", ""))
-            inv_t = float(list(filter(lambda x: 'investigation_time=' in x, ff))[0].replace(" investigation_time=", ""))
+            header_params = dict(_OQ_HEADER_PARAM_PATTERN.findall(header))
+            lon = float(header_params['lon'])
+            lat = float(header_params['lat'])
+            inv_t = float(header_params['investigation_time'])
+            # Annualize all poes in a single vectorized call; log1p keeps accuracy as poe approaches 0
+            return_period = np.round(-inv_t / np.log1p(-np.asarray(poes)))
             ims = np.unique(df['imt'])
             for imt in ims:
                 mag, dist = [], []
                 hz_cont = []
-                return_period = []
                 modeLst, meanLst = [], []
                 for poe in poes:
-                    return_period.append(round(-inv_t / np.log(1 - poe)))
-                    data = {}
-                    data['mag'] = df['mag'][(df['poe'] == poe) & (df['imt'] == imt)]
-                    data['dist'] = df['dist'][(df['poe'] == poe) & (df['imt'] == imt)]
-                    data['hz_cont'] = df[hz_key][(df['poe'] == poe) & (df['imt'] == imt)]
-                    hz_cont.append(data['hz_cont'] / data['hz_cont'].sum())
-                    data['hz_cont'] = hz_cont[-1]
-                    data = pd.DataFrame(data)
+                    selected = (df['poe'] == poe) & (df['imt'] == imt)
+                    mags = df.loc[selected, 'mag'].to_numpy()
+                    dists = df.loc[selected, 'dist'].to_numpy()
+                    contributions = df.loc[selected, hz_key].to_numpy()
+                    contributions = contributions / contributions.sum()
+                    hz_cont.append(contributions)
                     # Compute the modal values (highest hazard contribution)
-                    mode = data.sort_values(by='hz_cont', ascending=False)[0:1]
-                    modeLst.append([mode['mag'].values[0], mode['dist'].values[0]])
+                    mode_idx = contributions.argmax()
+                    modeLst.append([mags[mode_idx], dists[mode_idx]])
                     # Compute the mean value
-                    meanLst.append([np.sum(data['mag'] * data['hz_cont']), np.sum(data['dist'] * data['hz_cont'])])
+                    meanLst.append([mags @ contributions, dists @ contributions])
 
                     # Report the individual magnitude and distance bins
-                    mag.append(data['mag'])
-                    dist.append(data['dist'])
+                    mag.append(mags)
+                    dist.append(dists)
 
                 len_return_period = len(return_period)
                 mean_mags = []
@@ -338,65 +424,71 @@ def disaggregation_mag_dist_eps(mag_bin, dist_bind, path_disagg_results, output_
     # lets add the plotting options to make everything clearer
     cmap = cm.get_cmap('jet')  # Get desired colormap
 
-    mags = []
-    dists = []
-
     for file in os.listdir(path_disagg_results):
         if file.startswith(filename):
-            # Load the dataframe
-            df = pd.read_csv(''.join([path_disagg_results, '/', file]), skiprows=1)
+            # Read the header comment and load the dataframe in a single pass
+            with open(''.join([path_disagg_results, '/', file]), "r") as f:
+                header = f.readline()
+                df = pd.read_csv(f)
             for key in df.keys():
                 if key.startswith('rlz') or key == 'mean':
                     hz_key = key
-            poes = np.unique(df['poe']).tolist()
-            poes.sort(reverse=True)
+            poes = np.unique(df['poe'].to_numpy())[::-1].tolist()  # np.unique already sorts ascending
             # Get some salient values
-            f = open(''.join([path_disagg_results, '/', file]), "r")
-            ff = f.readline().split(',')
-            lon = float(list(filter(lambda x: 'lon=' in x, ff))[0].replace(" lon=", ""))
-            lat = float(list(filter(lambda x: 'lat=' in x, ff))[0].replace(" lat=", "").replace("\"\n", ""))
-            inv_t = float(list(filter(lambda x: 'investigation_time=' in x, ff))[0].replace(" investigation_time=", ""))
+            header_params = dict(_OQ_HEADER_PARAM_PATTERN.findall(header))
+            lon = float(header_params['lon'])
+            lat = float(header_params['lat'])
+            inv_t = float(header_params['investigation_time'])
+            # Annualize all poes in a single vectorized call; log1p keeps accuracy as poe approaches 0
+            return_period = np.round(-inv_t / np.log1p(-np.asarray(poes)))
             ims = np.unique(df['imt'])
             for imt in ims:
                 mod_list, mean_list = [], []
-                return_period = []
                 hz_cont = []
                 mag, dist, eps = [], [], []
                 for poe in poes:
-                    return_period.append(round(-inv_t / np.log(1 - poe)))
-                    data = {}
-                    data['mag'] = df['mag'][(df['poe'] == poe) & (df['imt'] == imt)]
-                    data['dist'] = df['dist'][(df['poe'] == poe) & (df['imt'] == imt)]
-                    data['eps'] = df['eps'][(df['poe'] == poe) & (df['imt'] == imt)]
-                    data['hz_cont'] = df[hz_key][(df['poe'] == poe) & (df['imt'] == imt)]
-                    hz_cont.append(np.array(data['hz_cont'] / data['hz_cont'].sum()))
-                    data['hz_cont'] = hz_cont[-1]
-                    data = pd.DataFrame(data)
-                    data_reduced = data.groupby(['mag', 'dist']).agg(['sum'])[('hz_cont', 'sum')].reset_index().droplevel(1, axis=1)
-                    # Compute the modal value (highest poe)
-                    mod = data_reduced.sort_values(by='hz_cont', ascending=False)[0:1]
-                    mod_list.append([mod['mag'].values[0], mod['dist'].values[0]])
+                    selected = (df['poe'] == poe) & (df['imt'] == imt)
+                    mags = df.loc[selected, 'mag'].to_numpy()
+                    dists = df.loc[selected, 'dist'].to_numpy()
+                    epss = df.loc[selected, 'eps'].to_numpy()
+                    contributions = df.loc[selected, hz_key].to_numpy()
+                    contributions = contributions / contributions.sum()
+                    hz_cont.append(contributions)
+                    # Sum the contributions of the epsilon bins for each magnitude-distance pair
+                    data_reduced = pd.DataFrame({'mag': mags, 'dist': dists, 'hz_cont': contributions}).groupby(
+                        ['mag', 'dist'], as_index=False)['hz_cont'].sum()
+                    reduced_mags = data_reduced['mag'].to_numpy()
+                    reduced_dists = data_reduced['dist'].to_numpy()
+                    reduced_conts = data_reduced['hz_cont'].to_numpy()
+                    # Compute the modal value (highest hazard contribution)
+                    mod_idx = reduced_conts.argmax()
+                    mod_list.append([reduced_mags[mod_idx], reduced_dists[mod_idx]])
                     # Compute the mean value
-                    mean_list.append([np.sum(data_reduced['mag'] * data_reduced['hz_cont']), np.sum(data_reduced['dist'] * data_reduced['hz_cont'])])
+                    mean_list.append([reduced_mags @ reduced_conts, reduced_dists @ reduced_conts])
 
                     # Report the individual magnitude and distance bins
-                    mag.append(np.array(data['mag']))
-                    dist.append(np.array(data['dist']))
-                    eps.append(np.array(data['eps']))
+                    mag.append(mags)
+                    dist.append(dists)
+                    eps.append(epss)
 
                 len_return_period = len(return_period)
                 mean_mags = []
                 mean_dists = []
                 mod_mags = []
                 mod_dists = []
-                num_eps = len(np.unique(np.asarray(eps)))
-                min_eps = np.min(np.unique(np.asarray(eps)))  # get range of colorbars so we can normalize
-                max_eps = np.max(np.unique(np.asarray(eps)))
+                unique_eps = np.unique(np.asarray(eps))  # sorted, computed once for the whole figure
+                num_eps = unique_eps.size
+                min_eps = unique_eps[0]  # get range of colorbars so we can normalize
+                max_eps = unique_eps[-1]
 
                 num_cols = int(np.floor(len_return_period / num_rows))
                 if np.mod(len_return_period, num_rows):
                     num_cols += 1
 
+                # scale each eps to [0,1], and get their rgb values once for the whole figure;
+                # the colormap accepts the full array and returns an (n_eps, 4) table
+                rgba = cmap((unique_eps - min_eps) / max_eps / 2)
+
                 fig = plt.figure(figsize=(19.2, 10.8))
                 for i in range(len_return_period):
                     ax1 = fig.add_subplot(num_rows, num_cols, i + 1, projection='3d')
@@ -410,21 +502,20 @@ def disaggregation_mag_dist_eps(mag_bin, dist_bind, path_disagg_results, output_
                     mod_mags.append(mod_list[i][0])
                     mod_dists.append(mod_list[i][1])
 
-                    # scale each eps to [0,1], and get their rgb values
-                    rgba = [cmap((k - min_eps) / max_eps / 2) for k in (np.unique(np.asarray(eps)))]
-                    num_triads_M_R_eps = len(dist[i])
-                    z = np.zeros(int(num_triads_M_R_eps / num_eps))
+                    # View the (mag, dist, eps) triads as (num_bins, num_eps) so each epsilon
+                    # slice is a strided column view instead of a fancy-indexed gather copy
+                    dist_2d = dist[i].reshape(-1, num_eps)
+                    mag_2d = mag[i].reshape(-1, num_eps)
+                    hz_cont_2d = hz_cont[i].reshape(-1, num_eps) * 100
+                    num_bins = dist_2d.shape[0]
+                    z = np.zeros(num_bins)
+                    dx = np.ones(num_bins) * dist_bind / 2
+                    dy = np.ones(num_bins) * mag_bin / 2
 
                     for l in range(num_eps):
-                        x = np.array(dist[i][np.arange(l, num_triads_M_R_eps, num_eps)])
-                        y = np.array(mag[i][np.arange(l, num_triads_M_R_eps, num_eps)])
-
-                        dx = np.ones(int(num_triads_M_R_eps / num_eps)) * dist_bind / 2
-                        dy = np.ones(int(num_triads_M_R_eps / num_eps)) * mag_bin / 2
-                        dz = np.array(hz_cont[i][np.arange(l, num_triads_M_R_eps, num_eps)]) * 100
-
-                        ax1.bar3d(x, y, z, dx, dy, dz, color=rgba[l], zsort='average', alpha=0.7, shade=True)
-                        z += dz  # add the height of each bar to know where to start the next
+                        dz = hz_cont_2d[:, l]
+                        ax1.bar3d(dist_2d[:, l], mag_2d[:, l], z, dx, dy, dz, color=rgba[l], zsort='average', alpha=0.7, shade=True)
+                        z = z + dz  # add the height of each bar to know where to start the next
 
                     ax1.set_xlabel('R [km]', labelpad=10)
                     ax1.set_ylabel('$M_{w}$', labelpad=10)
@@ -439,12 +530,9 @@ def disaggregation_mag_dist_eps(mag_bin, dist_bind, path_disagg_results, output_
                                  "{:.2f}".format(mean_list[i][0]), "{:.0f}".format(mean_list[i][1])),
                               fontsize=16, loc='right', verticalalignment='top', y=0.95)
 
-                    mags.append(mean_list[i][0])
-                    dists.append(mean_list[i][1])
-
                 legend_elements = []
                 for j in range(num_eps):
-                    legend_elements.append(Patch(facecolor=rgba[num_eps - j - 1], label=f"\u03B5 = {np.unique(np.asarray(eps))[num_eps - j - 1]:.2f}"))
+                    legend_elements.append(Patch(facecolor=rgba[num_eps - j - 1], label=f"\u03B5 = {unique_eps[num_eps - j - 1]:.2f}"))
 
                 fig.legend(handles=legend_elements, loc="lower center", borderaxespad=0., ncol=num_eps)
                 plt.subplots_adjust(hspace=0.05, wspace=0.05)  # adjust the subplot to the right for the legend
@@ -581,15 +669,16 @@ def content_from_zip(paths, zip_name):
 
     Returns
     -------
-    contents : dictionary
+    contents : list
         Containing raw contents of the files which are read from the zipfile.
     """
 
-    contents = {}
+    contents = []
     with zipfile.ZipFile(zip_name, 'r') as myzip:
-        for i in range(len(paths)):
-            with myzip.open(paths[i]) as myfile:
-                contents[i] = [x.decode('utf-8') for x in myfile.readlines()]
+        for path in paths:
+            with myzip.open(path) as myfile:
+                # Decode the whole member at once rather than line by line
+                contents.append(myfile.read().decode('utf-8').splitlines(keepends=True))
 
     return contents
 
@@ -683,10 +772,8 @@ def read_nga(in_filename=None, content=None, out_filename=None):
             npts = int(val[0])
             dt = float(val[1])
 
-        # Acceleration values
-        acc = np.array([])
-        for line in acc_data:
-            acc = np.append(acc, np.array(line.split(), dtype=float))
+        # Acceleration values, parsed in a single pass instead of per-line np.append calls
+        acc = np.array(''.join(acc_data).split(), dtype=float)
         dur = len(acc) * dt
         t = np.arange(0, dur, dt)
 
@@ -739,13 +826,12 @@ def read_esm(in_filename=None, content=None, out_filename=None):
                 content = inFileID.readlines()
 
         desc = content[:64]
-        dt = float(difflib.get_close_matches('SAMPLING_INTERVAL_S', content)[0].split()[1])
-        npts = len(content[64:])
+        dt = float(next(line for line in content[:64] if line.startswith('SAMPLING_INTERVAL_S')).split()[1])
         acc_data = content[64:]
-        acc = np.asarray([float(data) for data in acc_data], dtype=float)
+        npts = len(acc_data)
+        acc = np.asarray(acc_data, dtype=float) / 980.655  # cm/s**2 to g
         dur = len(acc) * dt
         t = np.arange(0, dur, dt)
-        acc = acc / 980.655  # cm/s**2 to g
 
         if out_filename is not None:
             np.savetxt(out_filename, acc, fmt='%1.4e')
@@ -759,7 +845,7 @@ def read_esm(in_filename=None, content=None, out_filename=None):
 # FUNCTIONS TO CREATE BUILDING CODE DESIGN SPECTRA
 # ---------------------------------------------------------------------
 
-def sae_ec8_part1(ag, xi, periods, importance_class, spectrum_type, site_class):
+def sae_ec8_part1(ag, xi, periods, importance_class, spectrum_type, site_class, dtype=np.float64):
     """
     Details
     -------
@@ -787,6 +873,9 @@ def sae_ec8_part1(ag, xi, periods, importance_class, spectrum_type, site_class):
         Type of spectrum ('Type1','Type2')
     site_class : str
         Site Soil Class ('A','B','C','D','E')
+    dtype : numpy.dtype, optional (The default is numpy.float64)
+        Floating point precision of the computed spectrum.
+        numpy.float32 is ample when the spectrum is only plotted or tabulated.
 
     Returns
     -------
@@ -795,60 +884,57 @@ def sae_ec8_part1(ag, xi, periods, importance_class, spectrum_type, site_class):
 
     """
 
-    spec_props = {
-        'Type1': {
-            'A': {'S': 1.00, 'Tb': 0.15, 'Tc': 0.4, 'Td': 2.0},
-            'B': {'S': 1.20, 'Tb': 0.15, 'Tc': 0.5, 'Td': 2.0},
-            'C': {'S': 1.15, 'Tb': 0.20, 'Tc': 0.6, 'Td': 2.0},
-            'D': {'S': 1.35, 'Tb': 0.20, 'Tc': 0.8, 'Td': 2.0},
-            'E': {'S': 1.40, 'Tb': 0.15, 'Tc': 0.5, 'Td': 2.0},
-        },
-
-        'Type2': {
-            'A': {'S': 1.00, 'Tb': 0.05, 'Tc': 0.25, 'Td': 1.2},
-            'B': {'S': 1.35, 'Tb': 0.05, 'Tc': 0.25, 'Td': 1.2},
-            'C': {'S': 1.50, 'Tb': 0.10, 'Tc': 0.25, 'Td': 1.2},
-            'D': {'S': 1.80, 'Tb': 0.10, 'Tc': 0.30, 'Td': 1.2},
-            'E': {'S': 1.60, 'Tb': 0.05, 'Tc': 0.25, 'Td': 1.2},
-        }
-    }
-
-    s = spec_props[spectrum_type][site_class]['S']
-    tb = spec_props[spectrum_type][site_class]['Tb']
-    tc = spec_props[spectrum_type][site_class]['Tc']
-    td = spec_props[spectrum_type][site_class]['Td']
+    s, tb, tc, td = _EC8_SPECTRUM_PROPS[(spectrum_type, site_class)]
 
     eta = max(np.sqrt(0.10 / (0.05 + xi)), 0.55)
 
-    if importance_class == 'I':
-        imp_factor = 0.8
-    elif importance_class == 'II':
-        imp_factor = 1.0
-    elif importance_class == 'III':
-        imp_factor = 1.2
-    elif importance_class == 'IV':
-        imp_factor = 1.4
+    if importance_class in _EC8_IMPORTANCE_FACTORS:
+        imp_factor = _EC8_IMPORTANCE_FACTORS[importance_class]
     else:
         print('Error! Cannot compute a value of Importance Factor')
 
     ag = ag * imp_factor
 
-    sae = []
-    for i in range(len(periods)):
-        if 0 <= periods[i] <= tb:
-            sat = ag * s * (1.0 + periods[i] / tb * (2.5 * eta - 1.0))
-        elif tb <= periods[i] <= tc:
-            sat = ag * s * 2.5 * eta
-        elif tc <= periods[i] <= td:
-            sat = ag * s * 2.5 * eta * (tc / periods[i])
-        elif periods[i] >= td:
-            sat = ag * s * 2.5 * eta * (tc * td / periods[i] / periods[i])
-        else:
-            print('Error! Cannot compute a value of Spectral Acceleration')
+    periods = np.asarray(periods, dtype=dtype)
+    # np.select evaluates every branch, hence guard the divisions against T = 0
+    periods_safe = np.where(periods == 0, periods.dtype.type(1.0), periods)
+    conditions = [periods <= tb,
+                  (periods > tb) & (periods <= tc),
+                  (periods > tc) & (periods <= td),
+                  periods > td]
+    values = [ag * s * (1.0 + periods / tb * (2.5 * eta - 1.0)),
+              np.full_like(periods, ag * s * 2.5 * eta),
+              ag * s * 2.5 * eta * (tc / periods_safe),
+              ag * s * 2.5 * eta * (tc * td / periods_safe ** 2)]
+    # The branch coefficients are float64 scalars, so cast the result rather
+    # than relying on value-based promotion to preserve the requested dtype
+    sae = np.select(conditions, values).astype(dtype, copy=False)
+
+    return sae
+
 
-        sae.append(sat)
+@njit(cache=True)
+def _sae_asce7_16_kernel(periods, sds, sd1, tl):
+    """
+    Details
+    -------
+    Compiled kernel of the ASCE 7-16 design spectrum.
+    The method is defined separately so that njit can be used as wrapper and the routine can be run faster.
+    Unlike the masked array expressions, the branches are fused into a single pass with no temporaries.
+    """
 
-    sae = np.array(sae)
+    t0 = 0.2 * (sd1 / sds)
+    ts = sd1 / sds
+    sae = np.zeros(len(periods))
+    for i in range(len(periods)):
+        if periods[i] < t0:
+            sae[i] = sds * (0.4 + 0.6 * periods[i] / t0)
+        if t0 <= periods[i] <= ts:
+            sae[i] = sds
+        if ts <= periods[i] <= tl:
+            sae[i] = sd1 / periods[i]
+        if tl < periods[i]:
+            sae[i] = (sd1 * tl) / (periods[i] ** 2)
 
     return sae
 
@@ -885,22 +971,19 @@ def sae_asce7_16(periods, sds, sd1, tl):
         Elastic acceleration response spectrum
     """
 
-    t0 = 0.2 * (sd1 / sds)
-    ts = sd1 / sds
-    sae = np.zeros(len(periods))
-    for i in range(len(periods)):
-        if periods[i] < t0:
-            sae[i] = sds * (0.4 + 0.6 * periods[i] / t0)
-        if t0 <= periods[i] <= ts:
-            sae[i] = sds
-        if ts <= periods[i] <= tl:
-            sae[i] = sd1 / periods[i]
-        if tl < periods[i]:
-            sae[i] = (sd1 * tl) / (periods[i] ** 2)
+    periods = np.asarray(periods, dtype=np.float64)
+
+    # Typical period arrays, e.g. np.arange(0.1, 4, 0.01), lie entirely on the
+    # constant-velocity branch; serve them with a single vector expression
+    if sd1 / sds < periods.min() and periods.max() <= tl:
+        return sd1 / periods
+
+    sae = _sae_asce7_16_kernel(periods, float(sds), float(sd1), float(tl))
 
     return sae
 
 
+@lru_cache(maxsize=1024)
 def site_parameters_asce7_16(lat, long, risk_category, site_class):
     """
     Details
@@ -938,8 +1021,9 @@ def site_parameters_asce7_16(lat, long, risk_category, site_class):
         Period value for long-period transition
     """
 
-    url = 'https://earthquake.usgs.gov/ws/designmaps/asce7-16.json?latitude=' + str(lat) + '&longitude=' + str(long) + '&riskCategory=' + risk_category + '&siteClass=' + site_class + '&title=Example'
-    web = json.loads(requests.get(url).text)  # get the info from webpage and convert json format to dictionary
+    url = 'https://earthquake.usgs.gov/ws/designmaps/asce7-16.json'
+    params = {'latitude': lat, 'longitude': long, 'riskCategory': risk_category, 'siteClass': site_class, 'title': 'Example'}
+    web = _session.get(url, params=params).json()  # get the info from webpage as a dictionary
     ss = web['response']['data']['ss']
     s1 = web['response']['data']['s1']
     fa = web['response']['data']['fa']
@@ -965,6 +1049,64 @@ def site_parameters_asce7_16(lat, long, risk_category, site_class):
     return sds, sd1, tl
 
 
+@lru_cache(maxsize=1)
+def _tbec2018_data():
+    """
+    Details
+    -------
+    Loads the seismic hazard map parameters of TBEC2018, once per session.
+
+    Returns
+    -------
+    data : pandas.DataFrame
+        Seismic hazard map parameters of TBEC2018.
+    """
+
+    csv_file = 'Parameters_TBEC2018.csv'
+    file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Meta_Data', csv_file)
+    return pd.read_csv(file_path)
+
+
+@lru_cache(maxsize=4)
+def _tbec2018_interpolator(poe):
+    """
+    Details
+    -------
+    Builds a linear interpolator over the TBEC2018 hazard map for the given
+    probability of exceedance. The hazard map is a regular lon/lat grid, so the
+    three map parameters are pivoted onto it and interpolated bilinearly without
+    any triangulation; scatter interpolation remains as a fallback in case the
+    map file ever carries an incomplete grid.
+
+    Parameters
+    ----------
+    poe : str
+        Targeted probability of exceedance in 50 years ('2', '10', '50', '68').
+
+    Returns
+    -------
+    interp : callable
+        Interpolator returning (PGA, SS, S1) for a (lon, lat) query.
+    """
+
+    data = _tbec2018_data()
+    columns = ['PGA (g) - %' + poe, 'SS (g) - %' + poe, 'S1 (g) - %' + poe]
+    pivots = [data.pivot(index='Latitude', columns='Longitude', values=column) for column in columns]
+    values = np.stack([pivot.to_numpy() for pivot in pivots], axis=-1)
+
+    if np.isnan(values).any():  # incomplete grid, fall back to scatter interpolation
+        points = np.column_stack([data['Longitude'].to_numpy(), data['Latitude'].to_numpy()])
+        scatter_values = np.column_stack([data[column].to_numpy() for column in columns])
+        interp = interpolate.LinearNDInterpolator(points, scatter_values)
+        return lambda lon, lat: interp(lon, lat)
+
+    lats = pivots[0].index.to_numpy()
+    lons = pivots[0].columns.to_numpy()
+    interp = interpolate.RegularGridInterpolator((lats, lons), values, method='linear')
+
+    return lambda lon, lat: interp((lat, lon))
+
+
 def site_parameters_tbec2018(lat, long, dd, site_class):
     """
     Details
@@ -1001,115 +1143,24 @@ def site_parameters_tbec2018(lat, long, dd, site_class):
         Period value for long-period transition
     """
 
-    csv_file = 'Parameters_TBEC2018.csv'
-    file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Meta_Data', csv_file)
-    data = pd.read_csv(file_path)
-
     # Check if the coordinates are within the limits
-    if long > np.max(data['Longitude']) or long < np.min(data['Longitude']):
+    if not _TBEC2018_LON_LIMITS[0] <= long <= _TBEC2018_LON_LIMITS[1]:
         raise ValueError('Longitude value must be within the limits: [24.55,45.95]')
-    if lat > np.max(data['Latitude']) or lat < np.min(data['Latitude']):
+    if not _TBEC2018_LAT_LIMITS[0] <= lat <= _TBEC2018_LAT_LIMITS[1]:
         raise ValueError('Latitude value must be within the limits: [34.25,42.95]')
 
-    # Targeted probability of exceedance in 50 years
-    if dd == 1:
-        poe = '2'
-    elif dd == 2:
-        poe = '10'
-    elif dd == 3:
-        poe = '50'
-    elif dd == 4:
-        poe = '68'
-
-    # Determine Peak Ground Acceleration PGA [g]
-    pga_col = 'PGA (g) - %' + poe
-    data_pga = np.array([data['Longitude'], data['Latitude'], data[pga_col]]).T
-    pga = interpolate.griddata(data_pga[:, 0:2], data_pga[:, 2], [(long, lat)], method='linear')
-
-    # Short period map spectral acceleration coefficient [dimensionless]
-    ss_col = 'SS (g) - %' + poe
-    data_ss = np.array([data['Longitude'], data['Latitude'], data[ss_col]]).T
-    ss = interpolate.griddata(data_ss[:, 0:2], data_ss[:, 2], [(long, lat)], method='linear')
-
-    # Map spectral acceleration coefficient for a 1.0 second period [dimensionless]
-    s1_col = 'S1 (g) - %' + poe
-    data_s1 = np.array([data['Longitude'], data['Latitude'], data[s1_col]]).T
-    s1 = interpolate.griddata(data_s1[:, 0:2], data_s1[:, 2], [(long, lat)], method='linear')
-
-    soil_parameters = {
-        'FS': {
-            'ZA': [0.8, 0.8, 0.8, 0.8, 0.8, 0.8],
-            'ZB': [0.9, 0.9, 0.9, 0.9, 0.9, 0.9],
-            'ZC': [1.3, 1.3, 1.2, 1.2, 1.2, 1.2],
-            'ZD': [1.6, 1.4, 1.2, 1.1, 1.0, 1.0],
-            'ZE': [2.4, 1.7, 1.3, 1.1, 0.9, 0.8]
-        },
-
-        'SS': [0.25, 0.5, 0.75, 1.0, 1.25, 1.5],
-
-        'F1': {
-            'ZA': [0.8, 0.8, 0.8, 0.8, 0.8, 0.8],
-            'ZB': [0.8, 0.8, 0.8, 0.8, 0.8, 0.8],
-            'ZC': [1.5, 1.5, 1.5, 1.5, 1.5, 1.4],
-            'ZD': [2.4, 2.2, 2.0, 1.9, 1.8, 1.7],
-            'ZE': [4.2, 3.3, 2.8, 2.4, 2.2, 2.0]
-        },
-
-        'S1': [0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+    # Targeted probability of exceedance in 50 years; invalid levels raise a KeyError here
+    # instead of surfacing later as an undefined name
+    poe = _TBEC2018_DD_TO_POE[dd]
 
-    }
+    # Peak ground acceleration [g], short period and 1.0 second map spectral acceleration
+    # coefficients [dimensionless], all resolved through a single cached triangulation
+    pga, ss, s1 = _tbec2018_interpolator(poe)(long, lat)
 
-    # Local soil response coefficient for the short period region
-    if ss <= soil_parameters['SS'][0]:
-        fs = soil_parameters['FS'][site_class][0]
-    elif soil_parameters['SS'][0] < ss <= soil_parameters['SS'][1]:
-        fs = (soil_parameters['FS'][site_class][1] - soil_parameters['FS'][site_class][0]) \
-             * (ss - soil_parameters['SS'][0]) / (soil_parameters['SS'][1] - soil_parameters['SS'][0]) \
-             + soil_parameters['FS'][site_class][0]
-    elif soil_parameters['SS'][1] < ss <= soil_parameters['SS'][2]:
-        fs = (soil_parameters['FS'][site_class][2] - soil_parameters['FS'][site_class][1]) \
-             * (ss - soil_parameters['SS'][1]) / (soil_parameters['SS'][2] - soil_parameters['SS'][1]) \
-             + soil_parameters['FS'][site_class][1]
-    elif soil_parameters['SS'][2] < ss <= soil_parameters['SS'][3]:
-        fs = (soil_parameters['FS'][site_class][3] - soil_parameters['FS'][site_class][2]) \
-             * (ss - soil_parameters['SS'][2]) / (soil_parameters['SS'][3] - soil_parameters['SS'][2]) \
-             + soil_parameters['FS'][site_class][2]
-    elif soil_parameters['SS'][3] < ss <= soil_parameters['SS'][4]:
-        fs = (soil_parameters['FS'][site_class][4] - soil_parameters['FS'][site_class][3]) \
-             * (ss - soil_parameters['SS'][3]) / (soil_parameters['SS'][4] - soil_parameters['SS'][3]) \
-             + soil_parameters['FS'][site_class][3]
-    elif soil_parameters['SS'][4] < ss <= soil_parameters['SS'][5]:
-        fs = (soil_parameters['FS'][site_class][5] - soil_parameters['FS'][site_class][4]) \
-             * (ss - soil_parameters['SS'][4]) / (soil_parameters['SS'][5] - soil_parameters['SS'][4]) \
-             + soil_parameters['FS'][site_class][4]
-    elif ss >= soil_parameters['SS'][5]:
-        fs = soil_parameters['FS'][site_class][5]
-
-    # Local soil response coefficient for 1.0 second period
-    if s1 <= soil_parameters['S1'][0]:
-        f1 = soil_parameters['F1'][site_class][0]
-    elif soil_parameters['S1'][0] < s1 <= soil_parameters['S1'][1]:
-        f1 = (soil_parameters['F1'][site_class][1] - soil_parameters['F1'][site_class][0]) \
-             * (s1 - soil_parameters['S1'][0]) / (soil_parameters['S1'][1] - soil_parameters['S1'][0]) \
-             + soil_parameters['F1'][site_class][0]
-    elif soil_parameters['S1'][1] < s1 <= soil_parameters['S1'][2]:
-        f1 = (soil_parameters['F1'][site_class][2] - soil_parameters['F1'][site_class][1]) \
-             * (s1 - soil_parameters['S1'][1]) / (soil_parameters['S1'][2] - soil_parameters['S1'][1]) \
-             + soil_parameters['F1'][site_class][1]
-    elif soil_parameters['S1'][2] < s1 <= soil_parameters['S1'][3]:
-        f1 = (soil_parameters['F1'][site_class][3] - soil_parameters['F1'][site_class][2]) \
-             * (s1 - soil_parameters['S1'][2]) / (soil_parameters['S1'][3] - soil_parameters['S1'][2]) \
-             + soil_parameters['F1'][site_class][2]
-    elif soil_parameters['S1'][3] < s1 <= soil_parameters['S1'][4]:
-        f1 = (soil_parameters['F1'][site_class][4] - soil_parameters['F1'][site_class][3]) \
-             * (s1 - soil_parameters['S1'][3]) / (soil_parameters['S1'][4] - soil_parameters['S1'][3]) \
-             + soil_parameters['F1'][site_class][3]
-    elif soil_parameters['S1'][4] < s1 <= soil_parameters['S1'][5]:
-        f1 = (soil_parameters['F1'][site_class][5] - soil_parameters['F1'][site_class][4]) \
-             * (s1 - soil_parameters['S1'][4]) / (soil_parameters['S1'][5] - soil_parameters['S1'][4]) \
-             + soil_parameters['F1'][site_class][4]
-    elif s1 >= soil_parameters['S1'][5]:
-        f1 = soil_parameters['F1'][site_class][5]
+    # Local soil response coefficients; np.interp clamps to the table end values,
+    # matching the constant plateaus outside the tabulated SS/S1 range
+    fs = np.interp(ss, _TBEC2018_SS_BREAKPOINTS, _TBEC2018_FS_TABLE[site_class])
+    f1 = np.interp(s1, _TBEC2018_S1_BREAKPOINTS, _TBEC2018_F1_TABLE[site_class])
 
     sds = ss * fs
     sd1 = s1 * f1
@@ -1118,11 +1169,14 @@ def site_parameters_tbec2018(lat, long, dd, site_class):
     return pga, sds, sd1, tl
 
 
-def sae_tbec2018(periods, sds, sd1, tl):
+def site_parameters_tbec2018_batch(lats, longs, dd, site_class):
     """
     Details
     -------
-    This method calculates the elastic design spectrum according to TBEC2018.
+    This method retrieves the elastic design spectrum parameters for many sites at once according to TBEC2018.
+    The hazard map is loaded and interpolated a single time, and the soil response
+    coefficients are resolved with vectorized table lookups, so regional screening
+    over thousands of sites costs about as much as a single site_parameters_tbec2018 call.
 
     References
     ----------
@@ -1130,54 +1184,135 @@ def sae_tbec2018(periods, sds, sd1, tl):
 
     Notes
     -----
+    The same earthquake ground motion intensity level and site soil class apply to all sites.
 
     Parameters
     ----------
-    periods :  numpy.ndarray
-        Period array for which elastic response spectrum is calculated
-    sds : float
-        Short period (0.2 sec) spectral acceleration coefficient
-    sd1 : float
-        Spectral acceleration coefficient at period 1.0
-    tl : float
-        Period value for long-period transition
+    lats : numpy.ndarray
+        Site latitudes
+    longs : numpy.ndarray
+        Site longitudes
+    dd :  int
+        Earthquake ground motion intensity level (1,2,3,4)
+    site_class : str
+        Site soil class ('ZA','ZB','ZC','ZD','ZE')
 
     Returns
     -------
-    sae : numpy.ndarray
-        Horizontal elastic acceleration response spectrum
-    sae_vert : numpy.ndarray
-        Vertical elastic acceleration response spectrum
+    PGA : numpy.ndarray
+        Peak ground accelerations
+    SDS : numpy.ndarray
+        Short period (0.2 sec) spectral acceleration coefficients
+    SD1 : numpy.ndarray
+        Spectral acceleration coefficients at period 1.0
+    TL : numpy.ndarray
+        Period values for long-period transition
+    """
+
+    lats = np.asarray(lats, dtype=float)
+    longs = np.asarray(longs, dtype=float)
+
+    # Check if the coordinates are within the limits
+    if longs.max() > _TBEC2018_LON_LIMITS[1] or longs.min() < _TBEC2018_LON_LIMITS[0]:
+        raise ValueError('Longitude values must be within the limits: [24.55,45.95]')
+    if lats.max() > _TBEC2018_LAT_LIMITS[1] or lats.min() < _TBEC2018_LAT_LIMITS[0]:
+        raise ValueError('Latitude values must be within the limits: [34.25,42.95]')
+
+    # Targeted probability of exceedance in 50 years
+    poe = _TBEC2018_DD_TO_POE[dd]
+
+    # A single interpolator evaluation over the (N, 2) query resolves all sites at once
+    map_values = _tbec2018_interpolator(poe)(longs, lats)
+    pga, ss, s1 = map_values[:, 0], map_values[:, 1], map_values[:, 2]
+
+    # Local soil response coefficients, interpolated for all sites in one call
+    fs = np.interp(ss, _TBEC2018_SS_BREAKPOINTS, _TBEC2018_FS_TABLE[site_class])
+    f1 = np.interp(s1, _TBEC2018_S1_BREAKPOINTS, _TBEC2018_F1_TABLE[site_class])
+
+    sds = ss * fs
+    sd1 = s1 * f1
+    tl = np.full_like(sds, 6.0)
+
+    return pga, sds, sd1, tl
+
+
+@njit(cache=True)
+def _sae_tbec2018_kernel(periods, sds, sd1, tl):
+    """
+    Details
+    -------
+    Compiled kernel of the TBEC2018 design spectra.
+    The method is defined separately so that njit can be used as wrapper and the routine can be run faster.
+    Both the horizontal and the vertical spectrum are filled in a single pass with no temporaries.
     """
 
     ta = 0.2 * sd1 / sds
     tb = sd1 / sds
-    tad = ta/3
-    tbd = tb/3
-    tld = tl/2
+    tad = ta / 3
+    tbd = tb / 3
+    tld = tl / 2
     sae = np.zeros(len(periods))
     sae_vert = np.zeros(len(periods))
-
     for i in range(len(periods)):
+        # Horizontal elastic response spectrum
         if periods[i] <= ta:
             sae[i] = (0.4 + 0.6 * periods[i] / ta) * sds
-        elif ta < periods[i] <= tb:
+        elif periods[i] <= tb:
             sae[i] = sds
-        elif tb < periods[i] <= tl:
+        elif periods[i] <= tl:
             sae[i] = sd1 / periods[i]
-        elif periods[i] > tl:
+        else:
             sae[i] = sd1 * tl / periods[i] ** 2
 
+        # Vertical elastic response spectrum; periods beyond tld keep zero
         if periods[i] <= tad:
             sae_vert[i] = (0.32 + 0.48 * periods[i] / tad) * sds
-        elif tad < periods[i] <= tbd:
+        elif periods[i] <= tbd:
             sae_vert[i] = 0.8 * sds
-        elif tbd < periods[i] <= tld:
+        elif periods[i] <= tld:
             sae_vert[i] = 0.8 * sds * tbd / periods[i]
 
     return sae, sae_vert
 
 
+def sae_tbec2018(periods, sds, sd1, tl):
+    """
+    Details
+    -------
+    This method calculates the elastic design spectrum according to TBEC2018.
+
+    References
+    ----------
+    TBEC. (2018). Turkish building earthquake code.
+
+    Notes
+    -----
+
+    Parameters
+    ----------
+    periods :  numpy.ndarray
+        Period array for which elastic response spectrum is calculated
+    sds : float
+        Short period (0.2 sec) spectral acceleration coefficient
+    sd1 : float
+        Spectral acceleration coefficient at period 1.0
+    tl : float
+        Period value for long-period transition
+
+    Returns
+    -------
+    sae : numpy.ndarray
+        Horizontal elastic acceleration response spectrum
+    sae_vert : numpy.ndarray
+        Vertical elastic acceleration response spectrum
+    """
+
+    periods = np.asarray(periods, dtype=np.float64)
+    sae, sae_vert = _sae_tbec2018_kernel(periods, float(sds), float(sd1), float(tl))
+
+    return sae, sae_vert
+
+
 def sae_tbec2007(periods, zone, soil):
 
     """
@@ -1249,11 +1384,13 @@ def sae_tbec2007(periods, zone, soil):
 # FUNCTIONS TO CHECK GMPES IMPLEMENTED IN OPENQUAKE
 # ---------------------------------------------------------------------
 
+@lru_cache(maxsize=1)
 def get_available_gmpes():
     """
     Details
     -------
     Retrieves available ground motion prediction equations (gmpe) in OpenQuake.
+    The registry is immutable after import, so the dictionary is built once and cached.
 
     Parameters
     ----------
@@ -1265,11 +1402,7 @@ def get_available_gmpes():
         Dictionary which contains available gmpes in openquake.
     """
 
-    gmpes = {}
-    for name, gmpe in gsim.get_available_gsims().items():
-        gmpes[name] = gmpe
-
-    return gmpes
+    return dict(gsim.get_available_gsims())
 
 
 def check_gmpe_attributes(gmpe):
@@ -1336,7 +1469,6 @@ def get_esm_token(username, password):
 
     Notes
     -------
-    Data must be obtained using any program supporting the HTTP-POST method, e.g. CURL.
     see: https://esm-db.eu/esmws/generate-signed-message/1/query-options.html
     Credentials must have been retrieved from https://esm-db.eu/#/home.
 
@@ -1353,18 +1485,11 @@ def get_esm_token(username, password):
         Path to token used to retrieve records from ESM_2018 database
     """
 
-    if sys.platform.startswith('win'):
-        command = 'curl --ssl-no-revoke -X POST -F ' + '\"' + \
-                  'message={' + '\\\"' + 'user_email' + '\\\": ' + '\\\"' + username + '\\\", ' + \
-                  '\\\"' + 'user_password' + '\\\": ' + '\\\"' + password + '\\\"}' + \
-                  '\" ' + '\"https://esm-db.eu/esmws/generate-signed-message/1/query\" > token.txt'
-    else:
-        command = 'curl -X POST -F \'message={\"user_email\": \"' + \
-                  username + '\",\"user_password\": \"' + password + \
-                  '\"}\' \"https://esm-db.eu/esmws/generate-signed-message/1/query\" > token.txt'
-
-    os.system(command)
+    message = json.dumps({'user_email': username, 'user_password': password})
+    response = _session.post('https://esm-db.eu/esmws/generate-signed-message/1/query', files={'message': (None, message)})
     token_path = os.path.join(os.getcwd(), 'token.txt')
+    with open(token_path, 'wb') as token_file:
+        token_file.write(response.content)
 
     return token_path
 
@@ -1393,7 +1518,12 @@ def make_dir(dir_path):
                           "It cannot be recreated.")
 
     if os.path.exists(dir_path):
-        shutil.rmtree(dir_path, ignore_errors=False, onerror=handle_remove_read_only)
+        if os.name == 'nt':
+            shutil.rmtree(dir_path, ignore_errors=False, onerror=handle_remove_read_only)
+        else:
+            # rm walks the tree in C, noticeably faster than shutil.rmtree
+            # on the large record set folders this routine usually clears
+            subprocess.run(['rm', '-rf', dir_path], check=True)
     os.makedirs(dir_path)
 
 
@@ -1443,27 +1573,22 @@ def run_time(start_time):
     """
     Details
     -------
-    Prints the time passed between start_time and finish_time (now)
-    in hours, minutes, seconds. startTime is a global variable.
+    Prints the time passed between start_time and now
+    in hours, minutes, seconds.
 
     Parameters
     ----------
-    start_time : int
-        The initial time obtained via time().
+    start_time : float
+        The initial time obtained via monotonic(). The monotonic clock is
+        immune to the system clock being adjusted while the run is going on.
 
     Returns
     -------
     None.
     """
 
-    finish_time = time()
-    # Procedure to obtained elapsed time in Hr, Min, and Sec
-    time_seconds = finish_time - start_time
-    time_minutes = int(time_seconds / 60)
-    time_hours = int(time_seconds / 3600)
-    time_minutes = int(time_minutes - time_hours * 60)
-    time_seconds = time_seconds - time_minutes * 60 - time_hours * 3600
-    print(f"Run time: {time_hours:.0f} hours: {time_minutes:.0f} minutes: {time_seconds:.2f} seconds")
+    elapsed = monotonic() - start_time
+    print(f"Run time: {timedelta(seconds=elapsed)}")
 
 
 def random_uniform(num_dimensions, num_samples, sampling_type):